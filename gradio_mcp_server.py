@@ -1,20 +1,59 @@
 import os
+import asyncio
+import atexit
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import gradio as gr
+from dataclasses import dataclass
 from dotenv import load_dotenv, find_dotenv
+import inspect
 import json
-from typing import Any, Dict, Callable, List
+import logging
+import logging.handlers
+import queue
+from typing import Callable
+import concurrent.futures
+import socket
 import sys
+import tempfile
 import time
-from urllib.parse import urlencode
 import signal
 import threading
 
+# orjson parses/serializes several times faster than stdlib json; fall back
+# to stdlib so the server still runs where orjson has no wheel
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
+
+# Buffered logging: handler threads enqueue records and a background
+# listener drains them to stderr, so request threads never block on I/O
+_log_queue = queue.Queue(-1)
+logger = logging.getLogger("fmmcp")
+logger.setLevel(os.getenv("FM_LOG_LEVEL", "INFO").upper())
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stderr))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 def log_info(msg):
-    print(msg, file=sys.stderr)
+    logger.info("%s", msg)
 
 def log_error(msg):
-    print(msg, file=sys.stderr)
+    logger.error("%s", msg)
 
 log_info("Attempting to launch gradio_mcp_server.py - version check")
 
@@ -27,11 +66,120 @@ if not find_dotenv():
 
 load_dotenv()
 
-FM_USERNAME = os.getenv('FM_USERNAME')
-FM_PASSWORD = os.getenv('FM_PASSWORD')
-FM_HOST = os.getenv('FM_HOST')
-FM_DATABASE = os.getenv('FM_DATABASE')
-FM_LAYOUT = os.getenv('FM_LAYOUT')
+# Re-apply the log level in case FM_LOG_LEVEL came from the .env file
+logger.setLevel(os.getenv("FM_LOG_LEVEL", "INFO").upper())
+
+@dataclass(frozen=True, slots=True)
+class FMConfig:
+    """FileMaker connection settings frozen at startup, with prebuilt URLs."""
+    host: str
+    database: str
+    layout: str
+    username: str
+    password: str
+    session_url: str
+    script_url_tmpl: str
+
+def _build_config():
+    """Bind the FM_* environment into an FMConfig, or None if incomplete."""
+    host = os.getenv('FM_HOST')
+    database = os.getenv('FM_DATABASE')
+    layout = os.getenv('FM_LAYOUT')
+    if not (host and database and layout):
+        return None
+    base = f"https://{host}/fmi/data/v1/databases/{database}"
+    return FMConfig(
+        host=host,
+        database=database,
+        layout=layout,
+        username=os.getenv('FM_USERNAME'),
+        password=os.getenv('FM_PASSWORD'),
+        session_url=f"{base}/sessions",
+        script_url_tmpl=f"{base}/layouts/{layout}/script/{{name}}"
+    )
+
+CFG = _build_config()
+
+# Shared HTTP session so every FileMaker call reuses pooled keep-alive
+# connections instead of paying a fresh TCP+TLS handshake per request
+FM_POOL_SIZE = int(os.getenv('FM_POOL_SIZE', '50'))
+FM_RETRIES = int(os.getenv('FM_RETRIES', '3'))
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=FM_POOL_SIZE,
+    pool_maxsize=FM_POOL_SIZE,
+    max_retries=Retry(
+        total=FM_RETRIES,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"]
+    )
+))
+SESSION.headers.update({"Content-Type": "application/json"})
+atexit.register(SESSION.close)
+
+# Exception classes meaning "the transport failed" / "the call timed out" on
+# the active HTTP stack; extended with the httpx equivalents below so every
+# handler that catches requests errors covers the HTTP/2 path too
+_TRANSPORT_ERRORS = (requests.exceptions.RequestException,)
+_TIMEOUT_ERRORS = (requests.exceptions.Timeout,)
+
+# Optional HTTP/2 transport: when FM_HTTP2 is set and httpx is installed,
+# concurrent script calls multiplex over a single TLS connection instead of
+# each taking an HTTP/1.1 connection from the pool
+_HTTP2_CLIENT = None
+if os.getenv("FM_HTTP2"):
+    try:
+        import httpx
+        _HTTP2_CLIENT = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=FM_POOL_SIZE),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
+        atexit.register(_HTTP2_CLIENT.close)
+        _TRANSPORT_ERRORS = _TRANSPORT_ERRORS + (httpx.HTTPError,)
+        _TIMEOUT_ERRORS = _TIMEOUT_ERRORS + (httpx.TimeoutException,)
+        log_info("Using httpx HTTP/2 client for FileMaker calls")
+    except ImportError as e:
+        # httpx.Client(http2=True) itself raises ImportError when the h2
+        # extra is missing, so report the actual failure rather than
+        # assuming httpx is absent
+        log_error(f"FM_HTTP2 is set but the HTTP/2 client is unavailable "
+                  f"(install httpx[http2]): {str(e)}; falling back to requests session")
+
+# Statuses worth retrying on the HTTP/2 path, mirroring the urllib3 Retry
+# policy mounted on the requests session (httpx has no built-in retries)
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def _http2_request(method, url, **kwargs):
+    """GET/POST on the HTTP/2 client with retry + backoff to match the session."""
+    last_exc = None
+    for attempt in range(FM_RETRIES + 1):
+        if attempt:
+            time.sleep(0.2 * (2 ** (attempt - 1)))
+        try:
+            response = getattr(_HTTP2_CLIENT, method)(url, **kwargs)
+        except httpx.TransportError as e:
+            last_exc = e
+            continue
+        if response.status_code in _RETRY_STATUSES and attempt < FM_RETRIES:
+            continue
+        return response
+    raise last_exc
+
+def _http_get(url, **kwargs):
+    if _HTTP2_CLIENT is not None:
+        # httpx buffers responses by default; stream= is a requests-only knob
+        kwargs.pop('stream', None)
+        return _http2_request('get', url, **kwargs)
+    return SESSION.get(url, **kwargs)
+
+def _http_post(url, **kwargs):
+    if _HTTP2_CLIENT is not None:
+        return _http2_request('post', url, **kwargs)
+    return SESSION.post(url, **kwargs)
 
 # Token cache for FileMaker authentication
 _fm_token_cache = {
@@ -40,8 +188,12 @@ _fm_token_cache = {
     "lock": threading.Lock()
 }
 
-# Global shutdown flag
-_shutdown_requested = False
+# Single auth header dict shared by all script calls and mutated in place on
+# token refresh, so the hot path allocates no per-call header dict
+_AUTH_HEADER = {"Authorization": ""}
+
+# Set by signal handlers and the Q[Enter] watcher; main() waits on it
+_shutdown_evt = threading.Event()
 
 def validate_environment():
     """Validate required environment variables are set"""
@@ -53,125 +205,338 @@ def validate_environment():
         return False
     return True
 
+def _handle_err(e, op, t0):
+    """Shared error reporting for the network helpers.
+
+    Dispatches on the exception type once instead of each caller carrying a
+    near-identical chain of except clauses, and formats the elapsed time
+    from a monotonic start. Returns the standard error dict.
+    """
+    elapsed = time.monotonic() - t0
+    if isinstance(e, _TIMEOUT_ERRORS):
+        log_error(f"{op} timed out after {elapsed:.2f} seconds")
+        return {"error": f"{op} timed out"}
+    if isinstance(e, _TRANSPORT_ERRORS):
+        log_error(f"Error during {op}: {str(e)}")
+        return {"error": f"{op} failed: {str(e)}"}
+    if isinstance(e, (KeyError, json.JSONDecodeError)):
+        log_error(f"Invalid response format from {op}: {str(e)}")
+        return {"error": f"Invalid response format: {str(e)}"}
+    log_error(f"Unexpected error during {op}: {str(e)}")
+    return {"error": f"Unexpected error: {str(e)}"}
+
+# Guards against stacking multiple proactive refresh threads
+_refresh_in_flight = threading.Event()
+
+def _refresh_token_bg():
+    """Re-authenticate in the background while callers keep the valid token."""
+    try:
+        get_fm_token(force=True)
+    finally:
+        _refresh_in_flight.clear()
+
 # Authenticate and get token with caching
-def get_fm_token():
+def get_fm_token(force=False):
     current_time = time.time()
-    
-    # Check cache first (thread-safe)
-    with _fm_token_cache["lock"]:
-        if (_fm_token_cache["token"] and 
-            current_time < _fm_token_cache["expires"]):
-            log_info("Using cached FileMaker token")
-            return _fm_token_cache["token"]
+
+    # Check cache first (thread-safe); force=True skips the cache after a
+    # 401/952 response told us the server no longer honors the token
+    if not force:
+        with _fm_token_cache["lock"]:
+            token = _fm_token_cache["token"]
+            expires = _fm_token_cache["expires"]
+        if token and current_time < expires - 30:
+            # In the last stretch of validity, refresh proactively so no
+            # caller ever pays the auth round-trip synchronously
+            if current_time > expires - 90 and not _refresh_in_flight.is_set():
+                _refresh_in_flight.set()
+                threading.Thread(target=_refresh_token_bg, daemon=True).start()
+            logger.debug("Using cached FileMaker token")
+            return token
     
     log_info("Attempting to get new FileMaker token...")
-    start_time = time.time()
-    url = f"https://{FM_HOST}/fmi/data/v1/databases/{FM_DATABASE}/sessions"
+    start_time = time.monotonic()
+    url = CFG.session_url
     try:
-        response = requests.post(
+        response = _http_post(
             url,
-            auth=(FM_USERNAME, FM_PASSWORD),
-            headers={"Content-Type": "application/json"},
+            auth=(CFG.username, CFG.password),
             json={},
             timeout=30
         )
         response.raise_for_status()
-        token = response.json()['response']['token']
+        token = _json_loads(response.content)['response']['token']
         
         # Cache the token (FileMaker tokens typically last 15 minutes)
         with _fm_token_cache["lock"]:
             _fm_token_cache["token"] = token
             _fm_token_cache["expires"] = current_time + (14 * 60)  # 14 minutes for safety
+            _AUTH_HEADER["Authorization"] = f"Bearer {token}"
         
-        log_info(f"FileMaker token obtained and cached successfully in {time.time() - start_time:.2f} seconds.")
+        logger.info("FileMaker token obtained and cached successfully in %.2f seconds.", time.monotonic() - start_time)
         return token
-    except requests.exceptions.Timeout:
-        log_error(f"FileMaker token request timed out after {time.time() - start_time:.2f} seconds")
-        return None
-    except requests.exceptions.RequestException as e:
-        log_error(f"Error getting FileMaker token: {str(e)}")
-        return None
-    except (KeyError, json.JSONDecodeError) as e:
-        log_error(f"Invalid response format from FileMaker: {str(e)}")
-        return None
     except Exception as e:
-        log_error(f"Unexpected error getting FileMaker token: {str(e)}")
+        _handle_err(e, "FileMaker token request", start_time)
         return None
 
+def _token_rejected(response):
+    """Check whether FileMaker rejected our cached token (HTTP 401 or error 952)."""
+    if response.status_code == 401:
+        return True
+    # FileMaker reports error 952 on a non-2xx status; never sniff the body
+    # of a successful response, which the caller is about to parse anyway
+    if 200 <= response.status_code < 300:
+        return False
+    try:
+        messages = _json_loads(response.content).get('messages', [])
+        return any(str(msg.get('code')) == '952' for msg in messages if isinstance(msg, dict))
+    except (ValueError, AttributeError):
+        return False
+
+# Counters confirming the steady-state path is a single authenticated GET
+_call_stats = {
+    "total": 0,
+    "reauths": 0,
+    "lock": threading.Lock()
+}
+
+def _get_with_token_retry(url, timeout, params=None):
+    """Perform an authenticated GET, refreshing the token at most once.
+
+    The cached token from get_fm_token is the only sanctioned auth path —
+    callers must never re-authenticate speculatively. In steady state every
+    script call is exactly one GET; only a 401 or FileMaker error 952
+    triggers a refresh and a single retry. Returns None if re-auth fails.
+    """
+    with _call_stats["lock"]:
+        _call_stats["total"] += 1
+    # stream=True defers the body read; callers parse response.content as
+    # bytes directly, so large script results skip the eager text buffering
+    response = _http_get(url, params=params, headers=_AUTH_HEADER, timeout=timeout, stream=True)
+    if _token_rejected(response):
+        # Release the streamed connection back to the pool before retrying
+        response.close()
+        log_info("Cached FileMaker token rejected, re-authenticating...")
+        with _call_stats["lock"]:
+            _call_stats["reauths"] += 1
+            total, reauths = _call_stats["total"], _call_stats["reauths"]
+        logger.info("Token re-auths: %d/%d calls", reauths, total)
+        if not get_fm_token(force=True):
+            return None
+        response = _http_get(url, params=params, headers=_AUTH_HEADER, timeout=timeout, stream=True)
+    return response
+
+def _script_url(script_name):
+    """Build the Data API URL for a script; done once per tool at build time."""
+    return CFG.script_url_tmpl.format(name=script_name)
+
 # Call a FileMaker script
 def call_filemaker_script(script_name, params):
-    log_info(f"Attempting to call FileMaker script: {script_name}...")
-    start_time = time.time()
+    return _invoke(_script_url(script_name), script_name, params)
+
+@functools.lru_cache(maxsize=256)
+def _encode_params(frozen_items):
+    """Memoized script.param encoding, keyed by sorted (key, type, value) triples.
+
+    Retry chains and agent loops often repeat a tool call with identical
+    parameters; this skips re-serializing them. The value's type is part of
+    the key because hash-equal values of different types (True vs 1) would
+    otherwise share a cache slot and serialize wrongly.
+    """
+    return _json_dumps({key: value for key, _, value in frozen_items})
+
+def _invoke(base_url, script_name, params):
+    """Execute a FileMaker script GET against a prebuilt URL."""
+    logger.info("Attempting to call FileMaker script: %s...", script_name)
+    start_time = time.monotonic()
     try:
-        token = get_fm_token()
-        if not token:
+        if not get_fm_token():
             return {"error": "Could not authenticate with FileMaker"}
-            
-        url = f"https://{FM_HOST}/fmi/data/v1/databases/{FM_DATABASE}/layouts/{FM_LAYOUT}/script/{script_name}"
+
+        query = None
         if params:
             try:
                 # FileMaker expects script parameters as a single JSON string in the 'script.param' query parameter
-                query_params = urlencode({'script.param': json.dumps(params)})
-                url = f"{url}?{query_params}"
+                try:
+                    encoded = _encode_params(tuple(sorted(
+                        (k, type(v).__name__, v) for k, v in params.items()
+                    )))
+                except TypeError:
+                    # Unhashable values (nested dicts/lists) skip the memo
+                    encoded = _json_dumps(params)
+                query = {'script.param': encoded}
             except (TypeError, ValueError) as e:
                 log_error(f"Error encoding script parameters: {str(e)}")
                 return {"error": f"Invalid script parameters: {str(e)}"}
 
-        response = requests.get(
-            url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=60
-        )
-        response.raise_for_status()
-        result = response.json()['response']
-        log_info(f"FileMaker script {script_name} called successfully in {time.time() - start_time:.2f} seconds.")
-        
+        response = _get_with_token_retry(base_url, timeout=60, params=query)
+        if response is None:
+            return {"error": "Could not re-authenticate with FileMaker"}
+        # Plain status check: the 2xx path skips HTTPError construction
+        if not 200 <= response.status_code < 300:
+            log_error(f"FileMaker script {script_name} returned HTTP {response.status_code}")
+            return {"error": f"Script {script_name} failed with HTTP {response.status_code}"}
+        result = _json_loads(response.content)['response']
+        logger.info("FileMaker script %s called successfully in %.2f seconds.", script_name, time.monotonic() - start_time)
+
         if 'scriptResult' in result:
             try:
-                return json.loads(result['scriptResult'])
+                return _json_loads(result['scriptResult'])
             except (json.JSONDecodeError, TypeError):
                 return result['scriptResult']
         return result
-        
-    except requests.exceptions.Timeout:
-        log_error(f"FileMaker script {script_name} timed out after {time.time() - start_time:.2f} seconds")
-        return {"error": f"Script {script_name} timed out"}
-    except requests.exceptions.RequestException as e:
-        log_error(f"Error calling FileMaker script {script_name}: {str(e)}")
-        return {"error": f"Script execution failed: {str(e)}"}
-    except (KeyError, json.JSONDecodeError) as e:
-        log_error(f"Invalid response format from FileMaker script {script_name}: {str(e)}")
-        return {"error": f"Invalid response format: {str(e)}"}
+
     except Exception as e:
-        log_error(f"Unexpected error calling FileMaker script {script_name}: {str(e)}")
-        return {"error": f"Unexpected error: {str(e)}"}
+        return _handle_err(e, f"FileMaker script {script_name}", start_time)
+
+# On-disk cache for the tool catalog so hot restarts skip the network
+_TOOLS_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "filemaker_mcp", "tools.json")
+FM_TOOLS_CACHE_TTL = int(os.getenv('FM_TOOLS_CACHE_TTL', '600'))
+
+def _load_cached_tools():
+    """Return the cached tool list if it is younger than the TTL, else None."""
+    try:
+        age = time.time() - os.path.getmtime(_TOOLS_CACHE_PATH)
+        if age < FM_TOOLS_CACHE_TTL:
+            with open(_TOOLS_CACHE_PATH, 'rb') as f:
+                tools = _json_loads(f.read())
+            if isinstance(tools, list):
+                log_info(f"Loaded {len(tools)} tools from cache ({age:.0f}s old)")
+                return tools
+    except (OSError, json.JSONDecodeError) as e:
+        log_info(f"Tool cache unavailable: {str(e)}")
+    return None
+
+def _store_cached_tools(tools):
+    """Atomically persist the tool list for fast restarts."""
+    try:
+        cache_dir = os.path.dirname(_TOOLS_CACHE_PATH)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            f.write(_json_dumps(tools))
+        os.replace(tmp_path, _TOOLS_CACHE_PATH)
+    except OSError as e:
+        log_error(f"Could not write tool cache: {str(e)}")
+
+class _BatchDispatcher:
+    """Coalesce concurrent tool calls into one FileMaker batch script call.
+
+    When FM_BATCH_SCRIPT names a script that accepts
+    {"calls": [{"name": ..., "params": ...}, ...]} and returns
+    {"results": [...]} in the same order, calls arriving within the flush
+    window share a single HTTPS round-trip. Anything else — a lone call, a
+    missing batch script, a malformed batch response — falls back to the
+    normal single-call path.
+    """
+
+    def __init__(self, script_name, window=0.01, max_batch=16, max_workers=4):
+        self.script_name = script_name
+        self.window = window
+        self.max_batch = max_batch
+        # Flushes run here so an in-flight HTTPS call never stalls the
+        # accumulation loop (and with it every subsequent tool call)
+        self._workers = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='fm-batch'
+        )
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def call(self, name, params):
+        future = concurrent.futures.Future()
+        self._queue.put((name, params, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._workers.submit(self._flush, batch)
+
+    def _flush(self, batch):
+        try:
+            self._dispatch(batch)
+        except Exception as e:
+            log_error(f"Batch dispatch error: {str(e)}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result({"error": f"Batch dispatch error: {str(e)}"})
+
+    def _dispatch(self, batch):
+        if len(batch) == 1:
+            name, params, future = batch[0]
+            future.set_result(_invoke(_script_url(name), name, params))
+            return
+
+        calls = [{"name": name, "params": params} for name, params, _ in batch]
+        result = _invoke(_script_url(self.script_name), self.script_name, {"calls": calls})
+        results = result.get("results") if isinstance(result, dict) else None
+        if isinstance(results, list) and len(results) == len(batch):
+            for (_, _, future), item in zip(batch, results):
+                future.set_result(item)
+        else:
+            # Batch script unavailable or response malformed; run singly
+            log_error(f"Batch script {self.script_name} did not return per-call results, falling back")
+            for name, params, future in batch:
+                future.set_result(_invoke(_script_url(name), name, params))
+
+_BATCH_SCRIPT = os.getenv('FM_BATCH_SCRIPT')
+_DISPATCHER = _BatchDispatcher(_BATCH_SCRIPT) if _BATCH_SCRIPT else None
 
 # Fetch tool list from FileMaker
-def get_tools_from_filemaker() -> list:
+def get_tools_from_filemaker(refresh: bool = False) -> list:
+    if not refresh:
+        cached = _load_cached_tools()
+        if cached is not None:
+            # Serve the cached catalog immediately and revalidate behind it
+            threading.Thread(target=_refresh_tools_bg, args=(cached,), daemon=True).start()
+            return cached
+
+    return _fetch_tools()
+
+def _refresh_tools_bg(cached_tools):
+    """Re-fetch the catalog after serving from cache and flag any drift."""
+    try:
+        fresh = _fetch_tools()
+        if fresh and fresh != cached_tools:
+            log_info("Tool catalog changed on the server; restart (or run with --refresh-tools) to pick up the new tools")
+    except Exception as e:
+        log_error(f"Background tool refresh failed: {str(e)}")
+
+def _fetch_tools() -> list:
     log_info("Attempting to fetch tool list from FileMaker...")
-    start_time = time.time()
+    start_time = time.monotonic()
     try:
-        token = get_fm_token()
-        if not token:
+        if not get_fm_token():
             log_error("Could not get FileMaker token for tool list")
             return []
-            
-        url = f"https://{FM_HOST}/fmi/data/v1/databases/{FM_DATABASE}/layouts/{FM_LAYOUT}/script/GetToolList"
-        response = requests.get(
-            url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=30
-        )
-        response.raise_for_status()
-        result = response.json()['response']
-        log_info(f"Raw FileMaker response: {json.dumps(result, indent=2)}")
+
+        url = _script_url("GetToolList")
+        response = _get_with_token_retry(url, timeout=30)
+        if response is None:
+            log_error("Could not re-authenticate with FileMaker for tool list")
+            return []
+        if not 200 <= response.status_code < 300:
+            log_error(f"Tool list request returned HTTP {response.status_code}")
+            return []
+        result = _json_loads(response.content)['response']
+        # Lazy %s formatting: the catalog is only rendered if DEBUG is enabled
+        logger.debug("Raw FileMaker response: %s", result)
         
         if 'scriptResult' not in result:
             log_error("No scriptResult in FileMaker response")
             return []
             
         try:
-            script_result = json.loads(result['scriptResult'])
+            script_result = _json_loads(result['scriptResult'])
         except (json.JSONDecodeError, TypeError) as e:
             log_error(f"Could not parse scriptResult as JSON: {str(e)}")
             return []
@@ -181,146 +546,180 @@ def get_tools_from_filemaker() -> list:
             log_error("Tools data is not a list")
             return []
             
-        log_info(f"Tool list fetched successfully in {time.time() - start_time:.2f} seconds. Found {len(tools)} tools.")
+        log_info(f"Tool list fetched successfully in {time.monotonic() - start_time:.2f} seconds. Found {len(tools)} tools.")
         # Log the names of all tools found
         tool_names = [tool.get('function', {}).get('name', 'unknown') for tool in tools if isinstance(tool, dict)]
         log_info(f"Tools found: {', '.join(tool_names)}")
+        _store_cached_tools(tools)
         return tools
-        
-    except requests.exceptions.Timeout:
-        log_error(f"Tool list request timed out after {time.time() - start_time:.2f} seconds")
-        return []
-    except requests.exceptions.RequestException as e:
-        log_error(f"Error fetching tool list from FileMaker: {str(e)}")
-        return []
-    except (KeyError, json.JSONDecodeError) as e:
-        log_error(f"Invalid response format from FileMaker: {str(e)}")
-        return []
+
     except Exception as e:
-        log_error(f"Unexpected error fetching tool list: {str(e)}")
+        _handle_err(e, "tool list fetch", start_time)
         return []
 
-def create_gradio_function(tool_data: Dict[str, Any]) -> Callable:
-    """Create a Gradio-compatible function from tool metadata."""
-    try:
-        # Validate tool_data structure first
-        if not isinstance(tool_data, dict) or 'function' not in tool_data:
-            log_error("Invalid tool data structure - missing function key")
-            return None
-            
-        function = tool_data['function']
-        if not isinstance(function, dict):
-            log_error("Invalid function data structure")
-            return None
-            
-        name = function.get('name')
-        if not name or not isinstance(name, str) or not name.isidentifier():
-            log_error(f"Tool missing valid name: {name}")
-            return None
-            
-        description = function.get('description', '')
-        parameters = function.get('parameters', {})
-        properties = parameters.get('properties', {}) if isinstance(parameters, dict) else {}
-        required = parameters.get('required', []) if isinstance(parameters, dict) else []
+# Mapping from JSON-schema types to Python annotations for tool signatures
+_TYPE_MAP = {
+    'string': str,
+    'number': float,
+    'integer': int,
+    'boolean': bool
+}
 
-        log_info(f"Creating Gradio function for {name} with parameters: {list(properties.keys())}")
+# Per-type Gradio input constructors, allocated once at module scope so the
+# per-parameter dispatch is a single dict lookup
+_COMPONENT_FACTORY = {
+    'string': lambda name, desc: gr.Textbox(label=name, placeholder=desc),
+    'number': lambda name, desc: gr.Number(label=name, info=desc),
+    'integer': lambda name, desc: gr.Number(label=name, info=desc),
+    'boolean': lambda name, desc: gr.Checkbox(label=name, info=desc)
+}
 
-        # Build the function signature with proper type hints
-        def create_function():
-            try:
-                # Build parameter list with type hints
-                param_list = []
-                type_mapping = {
-                    'string': 'str',
-                    'number': 'float', 
-                    'integer': 'int',
-                    'boolean': 'bool'
-                }
-                
-                # Separate required and optional parameters
-                required_params = []
-                optional_params = []
-                
-                for param_name, param_info in properties.items():
-                    if not isinstance(param_info, dict):
-                        continue
-                        
-                    # Validate parameter name
-                    if not param_name.isidentifier():
-                        log_error(f"Invalid parameter name: {param_name}")
-                        continue
-                        
-                    param_type = param_info.get('type', 'string')
-                    python_type = type_mapping.get(param_type, 'str')
-                    
-                    if param_name in required:
-                        required_params.append(f"{param_name}: {python_type}")
-                    else:
-                        optional_params.append(f"{param_name}: {python_type} = None")
-                
-                # Combine with required parameters first
-                param_list = required_params + optional_params
-                param_str = ", ".join(param_list)
-
-                # Create docstring with Args section for Gradio MCP
-                args_section = ""
-                if properties:
-                    args_section = "\n    Args:\n"
-                    for param_name, param_info in properties.items():
-                        if isinstance(param_info, dict):
-                            param_desc = param_info.get('description', '')
-                            param_type = param_info.get('type', 'string')
-                            args_section += f"        {param_name} ({param_type}): {param_desc}\n"
-
-                # Create the function code
-                func_code = f'''
-def {name}({param_str}) -> str:
-    """{description}{args_section}
-    Returns:
-        str: The result from FileMaker script execution
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """Per-tool metadata validated once, with parameters stored column-wise."""
+    name: str
+    description: str
+    param_names: tuple
+    param_types: tuple
+    param_descs: tuple
+    required: frozenset
+
+def parse_tool_spec(tool_data) -> ToolSpec | None:
+    """Validate one catalog entry into a ToolSpec, or None if malformed."""
+    if not isinstance(tool_data, dict) or 'function' not in tool_data:
+        log_error("Invalid tool data structure - missing function key")
+        return None
+
+    function = tool_data.get('function')
+    if not isinstance(function, dict):
+        log_error("Invalid function data structure")
+        return None
+
+    name = function.get('name')
+    if not name or not isinstance(name, str) or not name.isidentifier():
+        log_error(f"Tool missing valid name: {name}")
+        return None
+
+    parameters = function.get('parameters')
+    parameters = parameters if isinstance(parameters, dict) else {}
+    properties = parameters.get('properties') or {}
+
+    param_names = []
+    param_types = []
+    param_descs = []
+    for param_name, param_info in properties.items():
+        if not isinstance(param_info, dict):
+            continue
+        if not param_name.isidentifier():
+            log_error(f"Invalid parameter name: {param_name}")
+            continue
+        param_names.append(param_name)
+        param_types.append(param_info.get('type', 'string'))
+        param_descs.append(param_info.get('description', ''))
+
+    return ToolSpec(
+        name=name,
+        description=function.get('description', ''),
+        param_names=tuple(param_names),
+        param_types=tuple(param_types),
+        param_descs=tuple(param_descs),
+        required=frozenset(parameters.get('required') or ())
+    )
+
+@functools.lru_cache(maxsize=256)
+def _compile_signature(spec: ToolSpec):
+    """Build (signature, docstring) from a ToolSpec.
+
+    ToolSpec is frozen and hashable, so identical tool schemas — reloads,
+    duplicate catalogs — skip the Parameter/docstring construction entirely.
     """
-    params = {{}}
-'''
-                # Add parameter collection
-                for param_name in properties.keys():
-                    if param_name.isidentifier():
-                        func_code += f"    if {param_name} is not None:\n"
-                        func_code += f"        params['{param_name}'] = {param_name}\n"
-
-                func_code += f'''
-    result = call_filemaker_script("{name}", params)
-    return str(result)
-'''
-                
-                # Create the function namespace
-                namespace = {'call_filemaker_script': call_filemaker_script}
-                
-                # Execute the function code in the namespace
-                exec(func_code, namespace)
-                
-                return namespace[name]
-                
-            except Exception as e:
-                log_error(f"Error in create_function for {name}: {str(e)}")
-                return None
+    # Build the signature with required parameters first
+    sig_params = []
+    for is_required in (True, False):
+        for param_name, param_type in zip(spec.param_names, spec.param_types):
+            if (param_name in spec.required) != is_required:
+                continue
+            sig_params.append(inspect.Parameter(
+                param_name,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=inspect.Parameter.empty if is_required else None,
+                annotation=_TYPE_MAP.get(param_type, str)
+            ))
+
+    # Docstring with Args section for Gradio MCP
+    args_section = ""
+    if spec.param_names:
+        args_section = "\n    Args:\n"
+        for param_name, param_type, param_desc in zip(spec.param_names, spec.param_types, spec.param_descs):
+            args_section += f"        {param_name} ({param_type}): {param_desc}\n"
+
+    doc = (
+        f"{spec.description}{args_section}\n"
+        "    Returns:\n"
+        "        str: The result from FileMaker script execution\n    "
+    )
+    return inspect.Signature(sig_params, return_annotation=str), doc
+
+def _make_tool_fn(spec: ToolSpec) -> Callable:
+    """Build an async tool function as a closure with a synthetic signature.
 
-        # Create and return the function
-        tool_function = create_function()
-        if tool_function:
-            log_info(f"Successfully created Gradio function for {name}")
+    Gradio MCP only introspects __name__, __doc__ and __signature__, so a
+    generic closure with those attributes set behaves exactly like the old
+    per-tool generated source, without a parse+compile per tool.
+    """
+    name = spec.name
+    # Bind the script URL once at build time so the hot path skips the
+    # per-call f-string formatting; route through the batch dispatcher when
+    # one is configured
+    if _DISPATCHER is not None:
+        invoke = functools.partial(_DISPATCHER.call, name)
+    else:
+        invoke = functools.partial(_invoke, _script_url(name), name)
+
+    sig, doc = _compile_signature(spec)
+    sig_names = tuple(sig.parameters)
+
+    async def tool_fn(*args, **kwargs) -> str:
+        if not kwargs and len(args) == len(sig_names):
+            # Fast path for Gradio's positional calls: zip against the
+            # precomputed name tuple instead of a full Signature.bind
+            params = {k: v for k, v in zip(sig_names, args) if v is not None}
         else:
-            log_error(f"Failed to create Gradio function for {name}")
-        return tool_function
-        
-    except Exception as e:
-        log_error(f"Error creating function: {str(e)}")
-        return None
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if v is not None}
+        result = await asyncio.to_thread(invoke, params)
+        return str(result)
+
+    tool_fn.__signature__ = sig
+    tool_fn.__name__ = name
+    tool_fn.__qualname__ = name
+    tool_fn.__doc__ = doc
+    return tool_fn
+
+def _ping_product_info():
+    """Cheap unauthenticated GET that primes DNS and the TLS connection pool."""
+    try:
+        _http_get(f"https://{CFG.host}/fmi/data/v1/productInfo", timeout=5)
+    except _TRANSPORT_ERRORS as e:
+        log_info(f"Startup ping to FileMaker host failed (non-fatal): {str(e)}")
+
+async def _bootstrap():
+    """Run the independent startup round-trips concurrently.
+
+    The first token fetch and the connection warm-up don't depend on each
+    other, so gathering them saves one full round-trip off cold start before
+    the tool list is fetched.
+    """
+    await asyncio.gather(
+        asyncio.to_thread(get_fm_token),
+        asyncio.to_thread(_ping_product_info)
+    )
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
-    global _shutdown_requested
     log_info(f"Received signal {signum}, initiating graceful shutdown...")
-    _shutdown_requested = True
+    _shutdown_evt.set()
 
 def create_fallback_interface():
     """Create a simple interface when tools can't be loaded"""
@@ -334,99 +733,92 @@ def create_fallback_interface():
         title="FileMaker MCP Tools - Service Unavailable"
     )
 
-def setup_gradio_interface():
+def _prepare_tool(tool_data):
+    """Parse one tool's spec and build its closure; returns (spec, tool_func) or None.
+
+    Pure Python with no Gradio calls, so it is safe to run on a thread pool.
+    """
+    try:
+        spec = parse_tool_spec(tool_data)
+        if spec is None:
+            return None
+
+        log_info(f"Creating Gradio function: {spec.name}")
+        try:
+            return spec, _make_tool_fn(spec)
+        except Exception as e:
+            log_error(f"Error building tool function for {spec.name}: {str(e)}")
+            return None
+
+    except Exception as e:
+        tool_name = tool_data.get('function', {}).get('name', 'unknown') if isinstance(tool_data, dict) else 'unknown'
+        log_error(f"Error preparing tool {tool_name}: {str(e)}")
+        return None
+
+def _build_tool_interface(spec, tool_func):
+    """Build one tool's gr.Interface from a prepared spec; returns it or None.
+
+    Must run on a single thread: gr.Blocks construction mutates Gradio's
+    process-global Context, so concurrent builds corrupt each other.
+    """
+    try:
+        # Create input components
+        inputs = []
+        for param_name, param_type, param_desc in zip(spec.param_names, spec.param_types, spec.param_descs):
+            try:
+                factory = _COMPONENT_FACTORY.get(param_type, _COMPONENT_FACTORY['string'])
+                inputs.append(factory(param_name, param_desc))
+            except Exception as e:
+                log_error(f"Error creating input for {param_name}: {str(e)}")
+                continue
+
+        interface = gr.Interface(
+            fn=tool_func,
+            inputs=inputs,
+            outputs=gr.Textbox(label="Result"),
+            title=spec.name,
+            description=spec.description
+        )
+        return interface
+
+    except Exception as e:
+        log_error(f"Error creating interface for {spec.name}: {str(e)}")
+        return None
+
+def setup_gradio_interface(refresh_tools: bool = False):
     """Setup Gradio interface with dynamic FileMaker tools"""
     log_info("Starting tool setup...")
-    
+
     try:
-        tools_data = get_tools_from_filemaker()
+        tools_data = get_tools_from_filemaker(refresh=refresh_tools)
         log_info(f"Retrieved {len(tools_data)} tools from FileMaker")
 
         if not tools_data:
             log_error("No tools retrieved from FileMaker, creating fallback interface")
             return create_fallback_interface()
 
-        # Store functions for Gradio interface creation
-        tool_functions = {}
-        
-        # Create functions for each tool
-        for tool_data in tools_data:
-            try:
-                if not isinstance(tool_data, dict) or 'function' not in tool_data:
-                    log_error("Invalid tool data structure, skipping")
-                    continue
-                    
-                function = tool_data.get('function', {})
-                tool_name = function.get('name', 'unknown')
-                log_info(f"Creating Gradio function: {tool_name}")
-                
-                # Create the Gradio-compatible function
-                tool_func = create_gradio_function(tool_data)
-                if tool_func:
-                    tool_functions[tool_name] = (tool_func, tool_data)
-                    log_info(f"Successfully created Gradio function for {tool_name}")
-                else:
-                    log_error(f"Failed to create Gradio function for {tool_name}")
-                
-            except Exception as e:
-                tool_name = tool_data.get('function', {}).get('name', 'unknown') if isinstance(tool_data, dict) else 'unknown'
-                log_error(f"Error creating function {tool_name}: {str(e)}")
-                continue
-
-        if not tool_functions:
-            log_error("No valid tool functions created, creating fallback interface")
-            return create_fallback_interface()
+        # Parse specs and build closures concurrently (pure Python, and
+        # ex.map preserves catalog order); the gr.Interface construction
+        # below stays serial because it touches Gradio's global Context
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(tools_data))) as ex:
+            prepared = list(ex.map(_prepare_tool, tools_data))
 
-        # Create Gradio interface using gr.Interface for each tool
+        tab_names = []
         interfaces = []
-        for tool_name, (tool_func, tool_data) in tool_functions.items():
-            try:
-                function = tool_data.get('function', {})
-                description = function.get('description', '')
-                parameters = function.get('parameters', {})
-                properties = parameters.get('properties', {}) if isinstance(parameters, dict) else {}
-                
-                # Create input components
-                inputs = []
-                for param_name, param_info in properties.items():
-                    if not isinstance(param_info, dict):
-                        continue
-                        
-                    param_type = param_info.get('type', 'string')
-                    param_desc = param_info.get('description', '')
-                    
-                    try:
-                        if param_type == 'string':
-                            inputs.append(gr.Textbox(label=f"{param_name}", placeholder=param_desc))
-                        elif param_type in ['number', 'integer']:
-                            inputs.append(gr.Number(label=f"{param_name}", info=param_desc))
-                        elif param_type == 'boolean':
-                            inputs.append(gr.Checkbox(label=f"{param_name}", info=param_desc))
-                        else:
-                            inputs.append(gr.Textbox(label=f"{param_name}", placeholder=param_desc))
-                    except Exception as e:
-                        log_error(f"Error creating input for {param_name}: {str(e)}")
-                        continue
-                
-                # Create interface for this tool
-                interface = gr.Interface(
-                    fn=tool_func,
-                    inputs=inputs,
-                    outputs=gr.Textbox(label="Result"),
-                    title=tool_name,
-                    description=description
-                )
-                interfaces.append(interface)
-                
-            except Exception as e:
-                log_error(f"Error creating interface for {tool_name}: {str(e)}")
+        for item in prepared:
+            if item is None:
                 continue
-        
+            spec, tool_func = item
+            interface = _build_tool_interface(spec, tool_func)
+            if interface is not None:
+                tab_names.append(spec.name)
+                interfaces.append(interface)
+
         # Create tabbed interface if multiple tools, single interface if one tool
         if len(interfaces) > 1:
             demo = gr.TabbedInterface(
-                interfaces, 
-                tab_names=list(tool_functions.keys()),
+                interfaces,
+                tab_names=tab_names,
                 title="FileMaker MCP Tools"
             )
         elif len(interfaces) == 1:
@@ -435,9 +827,9 @@ def setup_gradio_interface():
             # Fallback if no interfaces created
             log_error("No valid interfaces created, using fallback")
             demo = create_fallback_interface()
-        
+
         return demo
-        
+
     except Exception as e:
         log_error(f"Error in setup_gradio_interface: {str(e)}")
         return create_fallback_interface()
@@ -448,18 +840,49 @@ def setup_gradio_interface():
 
 def wait_for_quit():
     """Wait for Q[Enter] to quit the server cleanly."""
-    import os
     while True:
         try:
             user_input = input("Press Q[Enter] at any time to shut down the server cleanly: ")
             if user_input.strip().lower() == "q":
                 print("Shutdown requested by user (Q[Enter])")
-                os._exit(0)
+                _shutdown_evt.set()
+                return
         except EOFError:
-            os._exit(0)
+            return
         except Exception:
             pass
 
+def _pick_port(candidates):
+    """Return the first port that can be bound on all interfaces, or None.
+
+    A bind probe costs microseconds, versus seconds for letting demo.launch
+    spin up uvicorn state only to crash on a port conflict.
+    """
+    for port in candidates:
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Match uvicorn's bind semantics: without SO_REUSEADDR a socket
+        # lingering in TIME_WAIT would wrongly disqualify the port
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            probe.bind(("0.0.0.0", port))
+            return port
+        except OSError:
+            continue
+        finally:
+            probe.close()
+
+    # All candidates busy: fall back to an OS-assigned free port
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        probe.bind(("0.0.0.0", 0))
+        port = probe.getsockname()[1]
+        log_info(f"All candidate ports busy, using OS-assigned port {port}")
+        return port
+    except OSError:
+        return None
+    finally:
+        probe.close()
+
 def main():
     """Main function to run the server (option 1: not pretty, but not uncommon)."""
     try:
@@ -472,9 +895,13 @@ def main():
             log_error("Environment validation failed. Exiting.")
             sys.exit(1)
         
+        # Warm the token cache and connection pool before fetching tools
+        log_info("Running startup handshake with FileMaker...")
+        asyncio.run(_bootstrap())
+
         # Setup Gradio interface with MCP support
         log_info("Setting up Gradio interface with MCP support...")
-        demo = setup_gradio_interface()
+        demo = setup_gradio_interface(refresh_tools='--refresh-tools' in sys.argv)
         
         if not demo:
             log_error("Failed to create Gradio interface. Exiting.")
@@ -483,37 +910,34 @@ def main():
         # Launch Gradio with MCP server enabled
         log_info("Starting Gradio server with MCP support for production deployment...")
         
-        # Try different ports if the default is busy
+        # Probe for a free port first so Gradio is launched exactly once
         ports_to_try = [7860, 7861, 7862, 7863, 7864]
-
-        for port in ports_to_try:
-            try:
-                log_info(f"Attempting to start server on port {port}...")
-                # Start the Q[Enter] shutdown thread
-                threading.Thread(target=wait_for_quit, daemon=True).start()
-                print("🔨 MCP server (using SSE) running. Q[Enter] will close cleanly.", file=sys.stderr)
-                demo.launch(
-                    server_port=port,
-                    server_name="0.0.0.0",  # Listen on all interfaces for server deployment
-                    mcp_server=True,
-                    share=False,
-                    prevent_thread_lock=False,
-                    show_error=True,
-                    quiet=False
-                )
-                log_info(f"Server successfully started on port {port}")
-                break
-            except OSError as e:
-                if "Address already in use" in str(e) or "Cannot find empty port" in str(e):
-                    log_info(f"Port {port} is busy, trying next port...")
-                    continue
-                else:
-                    log_error(f"Error starting server on port {port}: {str(e)}")
-                    continue
-        else:
+        port = _pick_port(ports_to_try)
+        if port is None:
             log_error("Could not find an available port in range 7860-7864")
             sys.exit(1)
 
+        log_info(f"Starting server on port {port}...")
+        # Start the Q[Enter] shutdown thread
+        threading.Thread(target=wait_for_quit, daemon=True).start()
+        print("🔨 MCP server (using SSE) running. Q[Enter] will close cleanly.", file=sys.stderr)
+        demo.launch(
+            server_port=port,
+            server_name="0.0.0.0",  # Listen on all interfaces for server deployment
+            mcp_server=True,
+            share=False,
+            prevent_thread_lock=True,
+            show_error=True,
+            quiet=False
+        )
+        log_info(f"Server successfully started on port {port}")
+
+        # Block on the shutdown event instead of Gradio's internal busy-wait,
+        # then close the server so signals and Q[Enter] actually take effect
+        _shutdown_evt.wait()
+        log_info("Shutdown event received, closing server...")
+        demo.close()
+
     except KeyboardInterrupt:
         log_info("Server shutdown requested by user (Ctrl+C)")
         sys.exit(0)